@@ -1,6 +1,10 @@
 """Ferramenta interativa para calibrar os 8 slots de cartas na tela."""
 
+import json
 from pathlib import Path
+import queue
+import threading
+import time
 
 import cv2
 import mss
@@ -9,32 +13,128 @@ import numpy as np
 CARD_WIDTH = 61
 CARD_HEIGHT = 90
 VIEW_SCALE = 0.5
+VIEW_BOX_THICKNESS = max(1, round(3 * VIEW_SCALE))
+VIEW_TEXT_THICKNESS = max(1, round(2 * VIEW_SCALE))
+VIEW_LABEL_OFFSET = max(1, round(10 * VIEW_SCALE))
+CROSSHAIR_HALF_SIZE = 20
+OPENCV_THREADS = 1
 MAX_SLOTS = 8
+SLOTS_CONFIG_FILENAME = "slots_config.json"
+TARGET_FPS = 30
+IDLE_FPS = 5
+FRAME_INTERVAL_SECONDS = 1.0 / TARGET_FPS
+IDLE_FRAME_INTERVAL_SECONDS = 1.0 / IDLE_FPS
 
 
 class SlotCalibrator:
     """Permite mapear manualmente os slots e exportar `SLOTS_CONFIG`."""
 
     def __init__(self):
-        self.sct = mss.mss()
-        if len(self.sct.monitors) > 1:
-            self.monitor = self.sct.monitors[1]
-        else:
-            self.monitor = self.sct.monitors[0]
+        # Operacoes por frame sao pequenas: o pool de threads do OpenCV custa mais do que ajuda.
+        cv2.setUseOptimized(True)
+        cv2.setNumThreads(OPENCV_THREADS)
+
+        # Usada apenas para descobrir o monitor; a captura roda com instancia propria na thread.
+        with mss.mss() as sct:
+            if len(sct.monitors) > 1:
+                self.monitor = dict(sct.monitors[1])
+            else:
+                self.monitor = dict(sct.monitors[0])
+
+        self._dim = (
+            int(self.monitor["width"] * VIEW_SCALE),
+            int(self.monitor["height"] * VIEW_SCALE),
+        )
+        self._resized = np.empty((self._dim[1], self._dim[0], 4), dtype=np.uint8)
 
         self.slots = []
+        self._slots_arr = np.zeros((0, 2), dtype=np.int32)
+        self._monitor_origin = np.array([self.monitor["left"], self.monitor["top"]], dtype=np.int32)
         self.pending_slot = None
         self.mouse_pos = (0, 0)
         self.window_name = "Calibracao de Slots - Clique nos cantos superiores esquerdos"
+        self._frame_queue: queue.Queue[np.ndarray] = queue.Queue(maxsize=1)
+        self._stop_event = threading.Event()
+        self._input_event = threading.Event()
+        self._dirty = True
+        self._static_overlay = np.zeros((self._dim[1], self._dim[0], 3), dtype=np.uint8)
+        self._static_mask = np.zeros((self._dim[1], self._dim[0], 1), dtype=bool)
+        self._static_bbox: tuple[slice, slice] | None = None
+        self._static_dirty = True
+        self._sprite_cache: dict[tuple, tuple[np.ndarray, np.ndarray, tuple[int, int]]] = {}
+
+    def capture_screen(self, sct: mss.base.MSSBase) -> np.ndarray:
+        """Captura a tela atual e retorna uma view BGRA sobre o buffer do mss."""
+        screenshot = sct.grab(self.monitor)
+        # `raw` e o proprio buffer preenchido pelo backend; `bgra`/`rgb` criariam copias.
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(
+            screenshot.height, screenshot.width, 4
+        )
+
+    def _capture_worker(self) -> None:
+        """Produz frames em segundo plano mantendo apenas o mais recente na fila."""
+        # Instancias do mss nao sao thread-safe: a thread usa a sua propria.
+        with mss.mss() as sct:
+            while not self._stop_event.is_set():
+                frame = self.capture_screen(sct)
+                try:
+                    self._frame_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._frame_queue.put(frame)
+                # Sem mouse/teclado a tela fica parada: captura no ritmo ocioso ate o proximo evento.
+                self._stop_event.wait(FRAME_INTERVAL_SECONDS)
+                self._input_event.wait(IDLE_FRAME_INTERVAL_SECONDS - FRAME_INTERVAL_SECONDS)
+                self._input_event.clear()
+
+    def _get_text_sprite(
+        self, text: str, scale: float, color: tuple[int, int, int], thickness: int
+    ) -> tuple[np.ndarray, np.ndarray, tuple[int, int]]:
+        """Rasteriza um texto fixo uma unica vez e devolve sprite, mascara e origem."""
+        key = (text, scale, color, thickness)
+        cached = self._sprite_cache.get(key)
+        if cached is not None:
+            return cached
+
+        (width, height), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)
+        origin = (thickness, height + thickness)
+        sprite = np.zeros((height + baseline + 2 * thickness, width + 2 * thickness, 3), dtype=np.uint8)
+        mask_img = np.zeros(sprite.shape[:2], dtype=np.uint8)
+        cv2.putText(sprite, text, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+        cv2.putText(mask_img, text, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, 255, thickness)
+
+        cached = (sprite, (mask_img > 0)[:, :, None], origin)
+        self._sprite_cache[key] = cached
+        return cached
+
+    def _draw_text(
+        self,
+        image: np.ndarray,
+        text: str,
+        org: tuple[int, int],
+        scale: float,
+        color: tuple[int, int, int],
+        thickness: int,
+    ) -> None:
+        """Equivalente a `cv2.putText` para textos estaticos, via blit do sprite em cache."""
+        sprite, mask, (origin_x, origin_y) = self._get_text_sprite(text, scale, color, thickness)
+        x0 = org[0] - origin_x
+        y0 = org[1] - origin_y
+        sprite_h, sprite_w = sprite.shape[:2]
+        img_h, img_w = image.shape[:2]
+
+        dst_x0, dst_y0 = max(0, x0), max(0, y0)
+        dst_x1, dst_y1 = min(img_w, x0 + sprite_w), min(img_h, y0 + sprite_h)
+        if dst_x0 >= dst_x1 or dst_y0 >= dst_y1:
+            return
 
-    def capture_screen(self) -> np.ndarray:
-        """Captura a tela atual e retorna frame em BGR."""
-        screenshot = self.sct.grab(self.monitor)
-        img = np.array(screenshot)
-        return cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
+        src = (slice(dst_y0 - y0, dst_y1 - y0), slice(dst_x0 - x0, dst_x1 - x0))
+        np.copyto(image[dst_y0:dst_y1, dst_x0:dst_x1, :3], sprite[src], where=mask[src])
 
     def mouse_callback(self, event, x, y, flags, param) -> None:
         """Processa eventos de mouse para marcar novos slots."""
+        self._dirty = True
+        self._input_event.set()
         if event == cv2.EVENT_MOUSEMOVE:
             self.mouse_pos = (x, y)
             return
@@ -59,6 +159,109 @@ class SlotCalibrator:
         print(f"\nSlot {len(self.slots)} marcado provisoriamente em ({screen_x}, {screen_y})")
         print("Pressione ENTER para confirmar ou BACKSPACE para cancelar.")
 
+    def _slot_view_rect(self, slot: dict) -> tuple[tuple[int, int], tuple[int, int]]:
+        """Converte um slot em coordenadas de tela para o retangulo na janela reduzida."""
+        x = slot["left"] - self.monitor["left"]
+        y = slot["top"] - self.monitor["top"]
+        return (
+            (int(x * VIEW_SCALE), int(y * VIEW_SCALE)),
+            (int((x + CARD_WIDTH) * VIEW_SCALE), int((y + CARD_HEIGHT) * VIEW_SCALE)),
+        )
+
+    def _rebuild_static_overlay(self) -> None:
+        """Redesenha a camada dos slots confirmados, que so muda quando um slot e adicionado."""
+        overlay = self._static_overlay
+        overlay.fill(0)
+        relative = self._slots_arr - self._monitor_origin
+        top_lefts = (relative * VIEW_SCALE).astype(np.int32)
+        bottom_rights = ((relative + (CARD_WIDTH, CARD_HEIGHT)) * VIEW_SCALE).astype(np.int32)
+        for slot, top_left, bottom_right in zip(self.slots, top_lefts.tolist(), bottom_rights.tolist()):
+            label_org = (top_left[0], top_left[1] - VIEW_LABEL_OFFSET)
+            cv2.rectangle(overlay, tuple(top_left), tuple(bottom_right), (0, 255, 0), VIEW_BOX_THICKNESS)
+            self._draw_text(
+                overlay, f"Slot {slot['id']}", label_org, VIEW_SCALE, (0, 255, 0), VIEW_TEXT_THICKNESS
+            )
+
+        np.any(overlay, axis=2, keepdims=True, out=self._static_mask)
+        rows = np.flatnonzero(self._static_mask.any(axis=(1, 2)))
+        cols = np.flatnonzero(self._static_mask.any(axis=(0, 2)))
+        if rows.size:
+            self._static_bbox = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        else:
+            self._static_bbox = None
+        self._static_dirty = False
+
+    @staticmethod
+    def _draw_crosshair(image: np.ndarray, center: tuple[int, int], color: tuple[int, int, int]) -> None:
+        """Desenha a mira do mouse com duas escritas em fatias, recortadas nas bordas."""
+        x, y = center
+        height, width = image.shape[:2]
+        x0, x1 = np.clip((x - CROSSHAIR_HALF_SIZE, x + CROSSHAIR_HALF_SIZE + 1), 0, width)
+        y0, y1 = np.clip((y - CROSSHAIR_HALF_SIZE, y + CROSSHAIR_HALF_SIZE + 1), 0, height)
+        # Espessura de 2 px, como o `cv2.line(..., 2)` original.
+        row0, row1 = np.clip((y - 1, y + 1), 0, height)
+        col0, col1 = np.clip((x - 1, x + 1), 0, width)
+        image[row0:row1, x0:x1, :3] = color
+        image[y0:y1, col0:col1, :3] = color
+
+    def _render_frame(self, frame: np.ndarray) -> None:
+        """Reduz o frame e desenha slots, mira e instrucoes direto na resolucao da janela."""
+        resized = self._resized
+        cv2.resize(frame, self._dim, dst=resized, interpolation=cv2.INTER_NEAREST)
+
+        if self._static_dirty:
+            self._rebuild_static_overlay()
+        if self._static_bbox is not None:
+            rows, cols = self._static_bbox
+            np.copyto(
+                resized[rows, cols, :3],
+                self._static_overlay[rows, cols],
+                where=self._static_mask[rows, cols],
+            )
+
+        if self.pending_slot:
+            top_left, bottom_right = self._slot_view_rect(self.pending_slot)
+            x, y = top_left
+            cv2.rectangle(resized, top_left, bottom_right, (0, 255, 255), VIEW_BOX_THICKNESS)
+            self._draw_text(
+                resized,
+                "Confirmar?",
+                (x, y - 3 * VIEW_LABEL_OFFSET),
+                0.8 * VIEW_SCALE,
+                (0, 255, 255),
+                VIEW_TEXT_THICKNESS,
+            )
+            self._draw_text(
+                resized,
+                "ENTER/BACK",
+                (x, y - VIEW_LABEL_OFFSET),
+                0.6 * VIEW_SCALE,
+                (0, 255, 255),
+                VIEW_TEXT_THICKNESS,
+            )
+
+        mouse_x_scaled = int(self.mouse_pos[0] / VIEW_SCALE)
+        mouse_y_scaled = int(self.mouse_pos[1] / VIEW_SCALE)
+        real_x = self.monitor["left"] + mouse_x_scaled
+        real_y = self.monitor["top"] + mouse_y_scaled
+
+        self._draw_crosshair(resized, self.mouse_pos, (0, 255, 255))
+
+        coord_text = f"X: {real_x}, Y: {real_y} | Slots marcados: {len(self.slots)}/{MAX_SLOTS}"
+        cv2.putText(resized, coord_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+
+        if self.pending_slot:
+            self._draw_text(
+                resized,
+                "CONFIRME O SLOT (ENTER / BACKSPACE)",
+                (10, 60),
+                0.7,
+                (0, 255, 255),
+                2,
+            )
+
+        cv2.imshow(self.window_name, resized)
+
     def run(self) -> None:
         """Executa o fluxo interativo de calibracao dos oito slots."""
         print("=" * 60)
@@ -76,103 +279,39 @@ class SlotCalibrator:
         cv2.namedWindow(self.window_name)
         cv2.setMouseCallback(self.window_name, self.mouse_callback)
 
-        while True:
-            frame = self.capture_screen()
-            debug_frame = frame.copy()
-
-            for slot in self.slots:
-                x = slot["left"] - self.monitor["left"]
-                y = slot["top"] - self.monitor["top"]
-                cv2.rectangle(debug_frame, (x, y), (x + CARD_WIDTH, y + CARD_HEIGHT), (0, 255, 0), 3)
-                cv2.putText(
-                    debug_frame,
-                    f"Slot {slot['id']}",
-                    (x, y - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    1,
-                    (0, 255, 0),
-                    2,
-                )
-
-            if self.pending_slot:
-                slot = self.pending_slot
-                x = slot["left"] - self.monitor["left"]
-                y = slot["top"] - self.monitor["top"]
-                cv2.rectangle(
-                    debug_frame,
-                    (x, y),
-                    (x + CARD_WIDTH, y + CARD_HEIGHT),
-                    (0, 255, 255),
-                    3,
-                )
-                cv2.putText(
-                    debug_frame,
-                    "Confirmar?",
-                    (x, y - 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.8,
-                    (0, 255, 255),
-                    2,
-                )
-                cv2.putText(
-                    debug_frame,
-                    "ENTER/BACK",
-                    (x, y - 10),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.6,
-                    (0, 255, 255),
-                    2,
-                )
-
-            dim = (
-                int(debug_frame.shape[1] * VIEW_SCALE),
-                int(debug_frame.shape[0] * VIEW_SCALE),
-            )
-            resized = cv2.resize(debug_frame, dim, interpolation=cv2.INTER_AREA)
-
-            mouse_x_scaled = int(self.mouse_pos[0] / VIEW_SCALE)
-            mouse_y_scaled = int(self.mouse_pos[1] / VIEW_SCALE)
-            real_x = self.monitor["left"] + mouse_x_scaled
-            real_y = self.monitor["top"] + mouse_y_scaled
-
-            cv2.line(
-                resized,
-                (self.mouse_pos[0] - 20, self.mouse_pos[1]),
-                (self.mouse_pos[0] + 20, self.mouse_pos[1]),
-                (0, 255, 255),
-                2,
-            )
-            cv2.line(
-                resized,
-                (self.mouse_pos[0], self.mouse_pos[1] - 20),
-                (self.mouse_pos[0], self.mouse_pos[1] + 20),
-                (0, 255, 255),
-                2,
-            )
-
-            coord_text = f"X: {real_x}, Y: {real_y} | Slots marcados: {len(self.slots)}/{MAX_SLOTS}"
-            cv2.putText(resized, coord_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
-
-            if self.pending_slot:
-                cv2.putText(
-                    resized,
-                    "CONFIRME O SLOT (ENTER / BACKSPACE)",
-                    (10, 60),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.7,
-                    (0, 255, 255),
-                    2,
-                )
+        self._stop_event.clear()
+        capture_thread = threading.Thread(target=self._capture_worker, daemon=True)
+        capture_thread.start()
 
-            cv2.imshow(self.window_name, resized)
+        next_idle_render = 0.0
 
-            key = cv2.waitKey(1) & 0xFF
+        while True:
+            loop_start = time.monotonic()
+            if self._dirty or loop_start >= next_idle_render:
+                try:
+                    frame = self._frame_queue.get(timeout=1.0)
+                except queue.Empty:
+                    frame = None
+                if frame is not None:
+                    self._render_frame(frame)
+                    self._dirty = False
+                    next_idle_render = loop_start + IDLE_FRAME_INTERVAL_SECONDS
+
+            remaining = FRAME_INTERVAL_SECONDS - (time.monotonic() - loop_start)
+            key = cv2.waitKey(max(1, int(remaining * 1000))) & 0xFF
+            if key != 0xFF:
+                self._dirty = True
+                self._input_event.set()
             if key == ord("q"):
                 print("\nCalibracao cancelada.")
                 break
             if key == 13:
                 if self.pending_slot:
                     self.slots.append(self.pending_slot)
+                    self._slots_arr = np.vstack(
+                        [self._slots_arr, [self.pending_slot["left"], self.pending_slot["top"]]]
+                    ).astype(np.int32)
+                    self._static_dirty = True
                     print(f"Slot {self.pending_slot['id']} CONFIRMADO.")
                     self.pending_slot = None
                 continue
@@ -190,29 +329,37 @@ class SlotCalibrator:
                 else:
                     print(f"\nAVISO: Voce marcou apenas {len(self.slots)} slots. Preciso de 8!")
 
+        self._stop_event.set()
+        self._input_event.set()
+        capture_thread.join(timeout=1.0)
         cv2.destroyAllWindows()
 
     def save_config(self) -> None:
-        """Imprime e salva a configuracao no formato usado em `detection.py`."""
+        """Salva a configuracao em JSON (lido por `detection.py`) e imprime o bloco equivalente."""
+        config_literal = "\n".join(
+            ["SLOTS_CONFIG = ["]
+            + [f'    {{"id": {slot["id"]}, "left": {slot["left"]}, "top": {slot["top"]}}},' for slot in self.slots]
+            + ["]"]
+        )
+
         print("\n" + "=" * 60)
         print("COORDENADAS SALVAS:")
         print("=" * 60)
-        print("\nCopie e cole no arquivo detection.py, substituindo SLOTS_CONFIG:\n")
-        print("SLOTS_CONFIG = [")
-        for slot in self.slots:
-            print(f'    {{"id": {slot["id"]}, "left": {slot["left"]}, "top": {slot["top"]}}},')
-        print("]")
+        print()
+        print(config_literal)
         print("\n" + "=" * 60)
 
-        output_file = Path(__file__).parent / "slots_config.txt"
-        with open(output_file, "w", encoding="utf-8") as file:
-            file.write("SLOTS_CONFIG = [\n")
-            for slot in self.slots:
-                file.write(f'    {{"id": {slot["id"]}, "left": {slot["left"]}, "top": {slot["top"]}}},\n')
-            file.write("]\n")
+        base_dir = Path(__file__).parent
+        json_file = base_dir / SLOTS_CONFIG_FILENAME
+        slots = [{"id": slot["id"], "left": slot["left"], "top": slot["top"]} for slot in self.slots]
+        json_file.write_text(json.dumps(slots, indent=2) + "\n", encoding="utf-8")
+
+        txt_file = base_dir / "slots_config.txt"
+        txt_file.write_text(config_literal + "\n", encoding="utf-8")
 
-        print(f"\nConfiguracao tambem salva em: {output_file}")
-        print("Voce pode copiar o conteudo desse arquivo para detection.py")
+        print(f"\nConfiguracao salva em: {json_file}")
+        print("O detection.py carrega esse arquivo automaticamente na proxima execucao.")
+        print(f"Copia no formato Python mantida em: {txt_file}")
 
 
 if __name__ == "__main__":
@@ -1,33 +1,80 @@
 """Download de imagens de cartas da API do Clash Royale."""
 
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+import json
 import os
 from pathlib import Path
+import shutil
 
 from dotenv import load_dotenv
 import requests
+import urllib3
+
+MAX_DOWNLOAD_WORKERS = 16
+VARIANTES_IMAGEM = ("medium", "evolutionMedium")
+TAMANHO_BLOCO_DOWNLOAD = 64 * 1024
+MAX_TENTATIVAS_DOWNLOAD = 4
+MANIFESTO_FILENAME = "manifest.json"
+
+_TABELA_SANITIZACAO = str.maketrans({" ": "-", **{char: "_" for char in '<>:"/\\|?*'}})
 
 
 def sanitize_filename(nome: str) -> str:
     """Normaliza o nome da carta para uso em arquivo."""
-    caracteres_invalidos = '<>:"/\\|?*'
-    nome_limpo = nome.lower()
-    nome_limpo = nome_limpo.replace(" ", "-")
-    for char in caracteres_invalidos:
-        nome_limpo = nome_limpo.replace(char, "_")
-    return nome_limpo
+    return nome.lower().translate(_TABELA_SANITIZACAO)
+
 
+def _carregar_manifesto(caminho: Path) -> dict:
+    """Le o cache de ETag/Last-Modified das imagens ja baixadas."""
+    try:
+        return json.loads(caminho.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _salvar_manifesto(caminho: Path, manifesto: dict) -> None:
+    """Persiste o cache de ETag/Last-Modified para a proxima execucao."""
+    caminho.write_text(json.dumps(manifesto, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _baixar_imagem(
+    session: requests.Session,
+    url: str,
+    destino: Path,
+    nome_carta: str,
+    variante: str,
+    manifesto: dict,
+) -> str:
+    """Baixa uma imagem de carta com GET condicional e salva no caminho informado."""
+    cabecalhos = {}
+    if destino.exists() and destino.stat().st_size > 0:
+        entrada = manifesto.get(url, {})
+        if entrada.get("etag"):
+            cabecalhos["If-None-Match"] = entrada["etag"]
+        cabecalhos["If-Modified-Since"] = entrada.get("last_modified") or formatdate(
+            destino.stat().st_mtime, usegmt=True
+        )
 
-def _baixar_imagem(url: str, destino: Path, nome_carta: str, variante: str) -> bool:
-    """Baixa uma imagem de carta e salva no caminho informado."""
     try:
-        img_response = requests.get(url, timeout=30)
-        img_response.raise_for_status()
-        destino.write_bytes(img_response.content)
-        print(f"  - {nome_carta} ({variante})")
-        return True
-    except (requests.RequestException, OSError) as exc:
+        destino_parcial = destino.with_name(destino.name + ".part")
+        with session.get(url, headers=cabecalhos, timeout=30, stream=True) as img_response:
+            if img_response.status_code == 304:
+                return "inalterada"
+            img_response.raise_for_status()
+            img_response.raw.decode_content = True
+            with open(destino_parcial, "wb") as arquivo:
+                shutil.copyfileobj(img_response.raw, arquivo, length=TAMANHO_BLOCO_DOWNLOAD)
+            destino_parcial.replace(destino)
+            manifesto[url] = {
+                "etag": img_response.headers.get("ETag"),
+                "last_modified": img_response.headers.get("Last-Modified"),
+                "size": destino.stat().st_size,
+            }
+        return "baixada"
+    except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as exc:
         print(f"  ! Erro ao baixar {nome_carta} ({variante}): {exc}")
-        return False
+        return "erro"
 
 
 def download_cards() -> None:
@@ -39,47 +86,59 @@ def download_cards() -> None:
 
     templates_dir = Path(__file__).parent / "cards-templates"
     templates_dir.mkdir(exist_ok=True)
+    caminho_manifesto = templates_dir / MANIFESTO_FILENAME
 
     url = "https://api.clashroyale.com/v1/cards"
     headers = {"Authorization": f"Bearer {token}"}
 
     print("Buscando cartas na API...")
-    response = requests.get(url, headers=headers, timeout=30)
-    response.raise_for_status()
+    with requests.Session() as session:
+        retries = urllib3.util.Retry(
+            total=MAX_TENTATIVAS_DOWNLOAD - 1,
+            backoff_factor=1.0,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+        )
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=MAX_DOWNLOAD_WORKERS, max_retries=retries)
+        session.mount("https://", adapter)
+
+        response = session.get(url, headers=headers, timeout=30)
+        response.raise_for_status()
+
+        payload = response.json()
+        cartas = payload.get("items", [])
 
-    payload = response.json()
-    cartas = payload.get("items", [])
+        print(f"Encontradas {len(cartas)} cartas. Iniciando download das imagens...")
 
-    print(f"Encontradas {len(cartas)} cartas. Iniciando download das imagens...")
+        cartas_baixadas = 0
+        tarefas = []
+        manifesto = _carregar_manifesto(caminho_manifesto)
 
-    cartas_baixadas = 0
-    imagens_baixadas = 0
+        for carta in cartas:
+            nome_carta = carta.get("name")
+            if not nome_carta:
+                continue
 
-    for carta in cartas:
-        nome_carta = carta.get("name")
-        if not nome_carta:
-            continue
+            nome_arquivo = sanitize_filename(nome_carta)
+            icon_urls = carta.get("iconUrls", {})
 
-        nome_arquivo = sanitize_filename(nome_carta)
-        icon_urls = carta.get("iconUrls", {})
+            for variante in VARIANTES_IMAGEM:
+                if variante in icon_urls:
+                    destino = templates_dir / f"{nome_arquivo}_{variante}.png"
+                    tarefas.append((session, icon_urls[variante], destino, nome_carta, variante, manifesto))
 
-        if "medium" in icon_urls:
-            url_medium = icon_urls["medium"]
-            caminho_medium = templates_dir / f"{nome_arquivo}_medium.png"
-            if _baixar_imagem(url_medium, caminho_medium, nome_carta, "medium"):
-                imagens_baixadas += 1
+            cartas_baixadas += 1
 
-        if "evolutionMedium" in icon_urls:
-            url_evolution = icon_urls["evolutionMedium"]
-            caminho_evolution = templates_dir / f"{nome_arquivo}_evolutionMedium.png"
-            if _baixar_imagem(url_evolution, caminho_evolution, nome_carta, "evolutionMedium"):
-                imagens_baixadas += 1
+        with ThreadPoolExecutor(max_workers=MAX_DOWNLOAD_WORKERS) as executor:
+            resultados = list(executor.map(lambda tarefa: _baixar_imagem(*tarefa), tarefas))
 
-        cartas_baixadas += 1
+    _salvar_manifesto(caminho_manifesto, manifesto)
 
     print(f"\nDownload concluído!")
     print(f"  Cartas processadas: {cartas_baixadas}")
-    print(f"  Imagens baixadas: {imagens_baixadas}")
+    print(f"  Imagens baixadas: {resultados.count('baixada')}")
+    print(f"  Sem alteracao (304): {resultados.count('inalterada')}")
+    print(f"  Falhas: {resultados.count('erro')}")
     print(f"  Pasta de destino: {templates_dir.absolute()}")
 
 
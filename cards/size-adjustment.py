@@ -1,3 +1,6 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import os
 from pathlib import Path
 
 from PIL import Image
@@ -6,6 +9,9 @@ from PIL import Image
 
 LARGURA_DESEJADA = 61
 ALTURA_DESEJADA = 90
+# Compressao rapida: os templates sao pequenos e o `optimize` do PNG repete o deflate varias vezes.
+PNG_COMPRESS_LEVEL = 1
+MODOS_ACEITOS = ("RGB", "RGBA")
 
 def redimensionar_e_salvar(caminho_imagem: Path, largura: int, altura: int) -> str:
     """Redimensiona uma imagem para o tamanho alvo e salva no mesmo arquivo."""
@@ -13,11 +19,12 @@ def redimensionar_e_salvar(caminho_imagem: Path, largura: int, altura: int) -> s
         img_para_salvar = None
 
         with Image.open(caminho_imagem) as img:
-            if img.size == (largura, altura) and img.mode == "RGBA":
+            if img.size == (largura, altura) and img.mode in MODOS_ACEITOS:
                 return "ignorada"
 
+            # A deteccao le os templates como BGR, entao fontes opacas nao precisam de alfa.
             img_work = img
-            if img_work.mode != "RGBA":
+            if img_work.mode not in MODOS_ACEITOS:
                 img_work = img_work.convert("RGBA")
 
             img_redimensionada = img_work.resize(
@@ -27,7 +34,12 @@ def redimensionar_e_salvar(caminho_imagem: Path, largura: int, altura: int) -> s
             img_para_salvar = img_redimensionada
 
         if img_para_salvar:
-            img_para_salvar.save(caminho_imagem, "PNG", optimize=True)
+            img_para_salvar.save(
+                caminho_imagem,
+                "PNG",
+                optimize=False,
+                compress_level=PNG_COMPRESS_LEVEL,
+            )
             return "processada"
 
         return "erro"
@@ -40,7 +52,10 @@ def processar_templates(pasta_templates: Path, largura: int, altura: int) -> Non
     if not pasta_templates.exists():
         raise FileNotFoundError(f"Pasta não encontrada: {pasta_templates}")
 
-    imagens = list(pasta_templates.glob("*.png"))
+    with os.scandir(pasta_templates) as entradas:
+        imagens = [
+            Path(entrada.path) for entrada in entradas if entrada.name.endswith(".png") and entrada.is_file()
+        ]
 
     if not imagens:
         print(f"Nenhuma imagem PNG encontrada em {pasta_templates}")
@@ -53,9 +68,11 @@ def processar_templates(pasta_templates: Path, largura: int, altura: int) -> Non
     ignoradas = 0
     erros = 0
 
-    for caminho in imagens:
-        status = redimensionar_e_salvar(caminho, largura, altura)
+    tarefa = partial(redimensionar_e_salvar, largura=largura, altura=altura)
+    with ProcessPoolExecutor() as executor:
+        resultados = list(executor.map(tarefa, imagens, chunksize=8))
 
+    for caminho, status in zip(imagens, resultados):
         if status == "processada":
             processadas += 1
         elif status == "ignorada":
@@ -1,10 +1,17 @@
 """Deteccao em tempo real das cartas do oponente por slots fixos."""
 
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+import hashlib
+import json
+import os
 from pathlib import Path
+import queue
+import threading
 from typing import Dict, Optional, Tuple
 import time
+import zipfile
 
 import cv2
 import numpy as np
@@ -13,8 +20,10 @@ from screen_capture import ScreenCapture
 
 CARD_WIDTH = 61
 CARD_HEIGHT = 90
+MATCH_WIDTH = CARD_WIDTH // 2
+MATCH_HEIGHT = CARD_HEIGHT // 2
 
-SLOTS_CONFIG = [
+DEFAULT_SLOTS_CONFIG = [
     {"id": 0, "left": 731, "top": 58},
     {"id": 1, "left": 796, "top": 58},
     {"id": 2, "left": 861, "top": 58},
@@ -25,17 +34,64 @@ SLOTS_CONFIG = [
     {"id": 7, "left": 1186, "top": 58},
 ]
 
+SLOTS_CONFIG_FILE = Path(__file__).parent / "slots_config.json"
 TEMPLATES_DIR = Path(__file__).parent / "cards" / "cards-templates"
 USER_TEMPLATES_DIR = Path(__file__).parent / "cards" / "cards-templates-user"
+TEMPLATES_CACHE_FILE = Path(__file__).parent / "cards" / "templates-cache.npz"
+TEMPLATES_CACHE_VERSION = 4
+TEMPLATE_DEDUP_SIMILARITY = 0.995
+TEMPLATE_LOAD_WORKERS = min(8, os.cpu_count() or 1)
+SLOT_UNKNOWN, SLOT_EMPTY, SLOT_FULL = 0, 1, 2
 CONFIRMATION_THRESHOLD = 0.75
 SATURATION_THRESHOLD = 60
+SATURATION_ROW_STEP = 2
 MAX_CAPTURE_FAILURES = 5
 CAPTURE_RETRY_SECONDS = 1.0
 POST_PLAY_CAPTURE_DELAY_SECONDS = 1.5
-DEBUG_VIEW_SCALE = 0.5
+TARGET_FPS = 15
+ACTIVE_POLL_SECONDS = 1.0 / TARGET_FPS
+IDLE_POLL_SECONDS = 0.25
+STABLE_SLOTS_SECONDS = 2.0
+DEBUG_VIEW_STRIDE = 3
+CAPTURE_REGION_MARGIN = 20
+REVIEW_OVERLAY_SCALE = 2
+REVIEW_PANEL_PADDING = 10
 SLOT_ROI_CENTER_SIZE = 40
 RED_COLOR_TOLERANCE = 25.0
 RED_BACKGROUND_COLORS_HEX = ("#92463a", "#843c32", "#9c4c3c", "#8c3c34", "#7c342c")
+RED_BACKGROUND_COLORS_BGR = np.array(
+    [(int(h[5:7], 16), int(h[3:5], 16), int(h[1:3], 16)) for h in RED_BACKGROUND_COLORS_HEX],
+    dtype=np.float32,
+)
+RED_COLOR_TOLERANCE_SQ = RED_COLOR_TOLERANCE**2
+SLOT_CENTER_ROWS = slice(
+    max(0, CARD_HEIGHT // 2 - SLOT_ROI_CENTER_SIZE), min(CARD_HEIGHT, CARD_HEIGHT // 2 + SLOT_ROI_CENTER_SIZE)
+)
+SLOT_CENTER_COLS = slice(
+    max(0, CARD_WIDTH // 2 - SLOT_ROI_CENTER_SIZE), min(CARD_WIDTH, CARD_WIDTH // 2 + SLOT_ROI_CENTER_SIZE)
+)
+_KEY_Q = ord("q")
+_KEY_YES = ord("y")
+_KEY_NO = ord("n")
+_KEY_EDIT = ord("e")
+
+
+def load_slots_config(config_file: Path = SLOTS_CONFIG_FILE) -> list[dict]:
+    """Carrega os slots gerados por `calibrate_slots.py`, com fallback para 1920x1080."""
+    if not config_file.exists():
+        return DEFAULT_SLOTS_CONFIG
+
+    try:
+        slots_config = json.loads(config_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        print(f"[WARN][SLOTS] Falha ao ler {config_file.name}: {exc}. Usando configuracao padrao.")
+        return DEFAULT_SLOTS_CONFIG
+
+    print(f"[INIT][SLOTS] Configuracao carregada de {config_file.name}")
+    return slots_config
+
+
+SLOTS_CONFIG = load_slots_config()
 
 
 class CardIdentifier:
@@ -43,76 +99,193 @@ class CardIdentifier:
 
     def __init__(self, templates_dirs: list[Path]):
         self.templates_dirs = templates_dirs
-        self.templates_cache: Dict[str, list[np.ndarray]] = {}
-        self._load_templates()
+        self._template_matrix = np.empty((0, MATCH_HEIGHT * MATCH_WIDTH), dtype=np.float32)
+        self._template_names: list[str] = []
+        self._ready = threading.Event()
+        threading.Thread(target=self._load_templates_in_background, daemon=True).start()
+
+    def _load_templates_in_background(self) -> None:
+        """Carrega os templates fora da thread principal e sinaliza quando terminar."""
+        try:
+            self._load_templates()
+        finally:
+            self._ready.set()
 
     def _load_templates(self) -> None:
-        """Carrega templates em memoria e agrega por nome de carta."""
-        total_loaded = 0
+        """Carrega os templates pre-processados, do cache em disco quando os PNGs nao mudaram."""
+        template_files = self._list_template_files()
+        cache_key = self._templates_cache_key(template_files)
+        if self._load_templates_cache(cache_key):
+            print(
+                f"[INIT][TEMPLATES] Cache {TEMPLATES_CACHE_FILE.name}: Total={len(self._template_names)} "
+                f"| Cartas unicas={len(set(self._template_names))}"
+            )
+            return
+
+        # imdecode/cvtColor liberam o GIL, entao a decodificacao escala com threads.
+        with ThreadPoolExecutor(max_workers=TEMPLATE_LOAD_WORKERS) as executor:
+            loaded = [
+                result
+                for result in executor.map(self._prepare_template, [path for path, _ in template_files])
+                if result is not None
+            ]
+        names = [card_name for card_name, _ in loaded]
+        templates = [template for _, template in loaded]
+
+        self._build_template_matrix(names, templates)
+        self._save_templates_cache(cache_key)
+        print(
+            f"[INIT][TEMPLATES] Total={len(self._template_names)} "
+            f"| Cartas unicas={len(set(self._template_names))}"
+        )
+
+    def _prepare_template(self, template_path: Path) -> Optional[Tuple[str, np.ndarray]]:
+        """Decodifica um PNG e retorna o nome da carta com o template no espaco de comparacao."""
+        try:
+            template_bytes = np.frombuffer(template_path.read_bytes(), dtype=np.uint8)
+            template_img = cv2.imdecode(template_bytes, cv2.IMREAD_COLOR)
+            if template_img is None:
+                return None
+
+            clean_name = template_path.stem.replace("_medium", "").replace("_evolutionMedium", "")
+            if "_" in clean_name:
+                parts = clean_name.rsplit("_", 1)
+                if len(parts) > 1 and parts[1].isdigit():
+                    clean_name = parts[0]
+
+            is_evo = "evolution" in clean_name.lower() or "evo" in clean_name.lower()
+            base_name = clean_name.replace("evolution", "").replace("evo", "").strip("_- ")
+            card_name = base_name.replace("-", " ").title()
+            if is_evo:
+                card_name += " Evo"
+
+            return (card_name, self._to_match_space(template_img))
+        except Exception as exc:
+            print(f"[WARN][TEMPLATES] Falha em {template_path.name}: {exc}")
+            return None
+
+    def _list_template_files(self) -> list[Tuple[Path, os.stat_result]]:
+        """Lista os PNGs de cada diretorio de templates com o stat usado na chave do cache."""
+        template_files: list[Tuple[Path, os.stat_result]] = []
         for templates_dir in self.templates_dirs:
             if not templates_dir.exists():
                 print(f"[WARN][TEMPLATES] Diretorio nao encontrado: {templates_dir}")
                 continue
 
-            png_files = list(templates_dir.glob("*.png"))
-            print(f"[INIT][TEMPLATES] {templates_dir.name}: carregando {len(png_files)} arquivo(s)")
+            with os.scandir(templates_dir) as entries:
+                dir_files = [
+                    (Path(entry.path), entry.stat())
+                    for entry in entries
+                    if entry.name.endswith(".png") and entry.is_file()
+                ]
+            print(f"[INIT][TEMPLATES] {templates_dir.name}: {len(dir_files)} arquivo(s)")
+            template_files.extend(sorted(dir_files))
+        return template_files
+
+    @staticmethod
+    def _templates_cache_key(template_files: list[Tuple[Path, os.stat_result]]) -> str:
+        """Resume nome, tamanho e mtime dos PNGs (e o espaco de comparacao/dedup) em uma chave."""
+        header = f"{TEMPLATES_CACHE_VERSION}:{MATCH_WIDTH}x{MATCH_HEIGHT}:{TEMPLATE_DEDUP_SIMILARITY}"
+        digest = hashlib.sha1(header.encode("utf-8"))
+        for template_path, stat in template_files:
+            digest.update(f"|{template_path}:{stat.st_size}:{stat.st_mtime_ns}".encode("utf-8"))
+        return digest.hexdigest()
+
+    def _load_templates_cache(self, cache_key: str) -> bool:
+        """Carrega a matriz de templates salva se a chave ainda corresponder aos PNGs."""
+        try:
+            with np.load(TEMPLATES_CACHE_FILE, allow_pickle=False) as cache:
+                if str(cache["key"]) != cache_key:
+                    return False
+                self._template_matrix = cache["matrix"]
+                self._template_names = cache["names"].tolist()
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return False
+        return True
+
+    def _save_templates_cache(self, cache_key: str) -> None:
+        """Salva a matriz normalizada e os nomes para a proxima inicializacao."""
+        partial_path = TEMPLATES_CACHE_FILE.with_name(TEMPLATES_CACHE_FILE.name + ".part")
+        try:
+            with open(partial_path, "wb") as cache_file:
+                np.savez(
+                    cache_file,
+                    key=np.array(cache_key),
+                    matrix=self._template_matrix,
+                    names=np.array(self._template_names, dtype=str),
+                )
+            partial_path.replace(TEMPLATES_CACHE_FILE)
+        except OSError as exc:
+            print(f"[WARN][TEMPLATES] Falha ao salvar cache {TEMPLATES_CACHE_FILE.name}: {exc}")
 
-            for template_path in png_files:
-                try:
-                    template_img = cv2.imread(str(template_path), cv2.IMREAD_COLOR)
-                    if template_img is None:
-                        continue
+    def _build_template_matrix(self, names: list[str], templates: list[np.ndarray]) -> None:
+        """Empilha os templates em uma matriz (N, H*W) com linhas de media zero e norma unitaria."""
+        if not names:
+            return
 
-                    clean_name = template_path.stem.replace("_medium", "").replace("_evolutionMedium", "")
-                    if "_" in clean_name:
-                        parts = clean_name.rsplit("_", 1)
-                        if len(parts) > 1 and parts[1].isdigit():
-                            clean_name = parts[0]
+        rows = self._normalize_rows(
+            np.stack([template.reshape(-1) for template in templates]).astype(np.float32)
+        )
+        keep = self._distinct_rows_mask(names, rows)
+        if not keep.all():
+            print(f"[INIT][TEMPLATES] {int((~keep).sum())} template(s) quase identico(s) descartado(s)")
+        self._template_matrix = np.ascontiguousarray(rows[keep])
+        self._template_names = [name for name, kept in zip(names, keep) if kept]
 
-                    is_evo = "evolution" in clean_name.lower() or "evo" in clean_name.lower()
-                    base_name = clean_name.replace("evolution", "").replace("evo", "").strip("_- ")
-                    card_name = base_name.replace("-", " ").title()
-                    if is_evo:
-                        card_name += " Evo"
+    @staticmethod
+    def _distinct_rows_mask(names: list[str], rows: np.ndarray) -> np.ndarray:
+        """Marca os templates a manter, descartando copias quase identicas da mesma carta."""
+        keep = np.ones(len(names), dtype=bool)
+        kept_by_name: Dict[str, list[int]] = {}
+        for index, name in enumerate(names):
+            kept = kept_by_name.setdefault(name, [])
+            if kept and float((rows[kept] @ rows[index]).max()) >= TEMPLATE_DEDUP_SIMILARITY:
+                keep[index] = False
+            else:
+                kept.append(index)
+        return keep
 
-                    self.templates_cache.setdefault(card_name, []).append(template_img)
-                    total_loaded += 1
-                except Exception as exc:
-                    print(f"[WARN][TEMPLATES] Falha em {template_path.name}: {exc}")
+    @staticmethod
+    def _normalize_rows(rows: np.ndarray) -> np.ndarray:
+        """Centraliza e normaliza cada linha; o produto interno vira o TM_CCOEFF_NORMED."""
+        rows = rows - rows.mean(axis=-1, keepdims=True)
+        norms = np.linalg.norm(rows, axis=-1, keepdims=True)
+        return np.divide(rows, norms, out=np.zeros_like(rows), where=norms > 0)
 
-        print(f"[INIT][TEMPLATES] Total={total_loaded} | Cartas unicas={len(self.templates_cache)}")
+    @staticmethod
+    def _to_match_space(img: np.ndarray) -> np.ndarray:
+        """Converte uma imagem BGR para o espaco de comparacao (cinza suavizado, meia resolucao)."""
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        # A media 3x3 antes do INTER_AREA deixa o score tolerante a recortes deslocados.
+        gray = cv2.blur(gray, (3, 3))
+        return cv2.resize(gray, (MATCH_WIDTH, MATCH_HEIGHT), interpolation=cv2.INTER_AREA)
 
     def get_best_guess(self, target_img: np.ndarray) -> Tuple[Optional[str], float]:
         """Retorna o nome e score da melhor correspondencia encontrada."""
-        if not self.templates_cache:
-            return (None, 0.0)
-
-        target_gray = cv2.cvtColor(target_img, cv2.COLOR_BGR2GRAY)
-        target_gray = cv2.GaussianBlur(target_gray, (3, 3), 0)
-
-        best_match: Optional[str] = None
-        best_score = 0.0
-
-        for card_name, templates in self.templates_cache.items():
-            for template in templates:
-                try:
-                    template_gray = cv2.cvtColor(template, cv2.COLOR_BGR2GRAY)
-                    template_gray = cv2.GaussianBlur(template_gray, (3, 3), 0)
-                    if template_gray.shape[:2] != target_gray.shape[:2]:
-                        template_gray = cv2.resize(
-                            template_gray,
-                            (target_gray.shape[1], target_gray.shape[0]),
-                        )
-
-                    result = cv2.matchTemplate(target_gray, template_gray, cv2.TM_CCOEFF_NORMED)
-                    _, max_val, _, _ = cv2.minMaxLoc(result)
-                    if max_val > best_score:
-                        best_score = max_val
-                        best_match = card_name
-                except Exception:
-                    continue
+        return self.get_best_guesses([target_img])[0]
 
-        return (best_match, best_score)
+    def get_best_guesses(self, target_imgs: list[np.ndarray]) -> list[Tuple[Optional[str], float]]:
+        """Retorna nome e score da melhor correspondencia de cada alvo, em uma unica multiplicacao."""
+        self._ready.wait()
+        if not self._template_names or not target_imgs:
+            return [(None, 0.0)] * len(target_imgs)
+
+        target_rows = self._normalize_rows(
+            np.stack([self._to_match_space(img).reshape(-1) for img in target_imgs]).astype(np.float32)
+        )
+
+        # Mesmo tamanho de alvo e template: o matchTemplate teria uma unica posicao,
+        # entao todos os scores saem de um unico produto de matrizes (N templates x K alvos).
+        scores = self._template_matrix @ target_rows.T
+        best_indices = np.argmax(scores, axis=0)
+        guesses: list[Tuple[Optional[str], float]] = []
+        for target_index, best_index in enumerate(best_indices):
+            best_score = float(scores[best_index, target_index])
+            if best_score <= 0.0:
+                guesses.append((None, 0.0))
+            else:
+                guesses.append((self._template_names[best_index], best_score))
+        return guesses
 
 
 @dataclass
@@ -122,11 +295,21 @@ class SlotInfo:
     nome_carta: Optional[str] = None
 
 
+@dataclass
+class PlayRecord:
+    """Jogada na ordem da transicao; fica pendente ate a carta ser identificada ou descartada."""
+
+    slot_id: int
+    card_name: Optional[str] = None
+    source: Optional[str] = None
+    resolved: bool = False
+
+
 class GameState:
     """Armazena o estado identificado dos oito slots."""
 
     def __init__(self):
-        self.slots_info: Dict[int, SlotInfo] = {i: SlotInfo() for i in range(8)}
+        self.slots_info: list[SlotInfo] = [SlotInfo() for _ in range(len(SLOTS_CONFIG))]
 
     def registrar_carta_identificada(self, slot_id: int, nome_carta: str) -> None:
         """Registra ou atualiza a carta de um slot."""
@@ -205,57 +388,142 @@ class GameWatcher:
     def __init__(self):
         self.capturer = ScreenCapture()
         self.monitor = self.capturer.get_monitor_info()
-        self.slots_status = {i: "UNKNOWN" for i in range(len(SLOTS_CONFIG))}
-        self.slots_identity: Dict[int, Optional[str]] = {i: None for i in range(len(SLOTS_CONFIG))}
+        self.slots_status = np.full(len(SLOTS_CONFIG), SLOT_UNKNOWN, dtype=np.uint8)
+        self.slots_identity: list[Optional[str]] = [None] * len(SLOTS_CONFIG)
         self.card_identifier = CardIdentifier([TEMPLATES_DIR, USER_TEMPLATES_DIR])
         self.game_state = GameState()
         self.opponent_tracker = OpponentHandTracker()
+        self.headless = os.environ.get("WATCHER_HEADLESS") == "1"
+        self._debug_frame: Optional[np.ndarray] = None
+        self._slot_rects = self._build_slot_rects()
+        self._capture_region = self._fit_capture_region()
+        self._active_slots = [slot_id for slot_id, rect in enumerate(self._slot_rects) if rect]
+        self._active_index = np.array(self._active_slots, dtype=np.intp)
+        self._slot_stack = np.empty(
+            (len(self._active_slots), CARD_HEIGHT, CARD_WIDTH, 3), dtype=np.uint8
+        )
+        self._previous_slot_stack = np.empty_like(self._slot_stack)
+        self._last_is_full: Optional[np.ndarray] = None
+        self._pending_captures: Dict[int, float] = {}
+        self._slots_in_review: set[int] = set()
+        self._play_records: deque[PlayRecord] = deque()
+        self._pending_plays: Dict[int, PlayRecord] = {}
+        self._review_backlog: deque[Tuple[int, np.ndarray, Optional[str], float]] = deque()
+        self._review_requests: "queue.Queue[Tuple[int, np.ndarray, Optional[str], float]]" = queue.Queue()
+        self._review_results: "queue.Queue[Tuple[int, Optional[str], str]]" = queue.Queue()
+        threading.Thread(target=self._review_worker, daemon=True).start()
 
     def capture_screen(self) -> Optional[np.ndarray]:
-        """Captura o frame atual da tela."""
-        return self.capturer.grab()
+        """Captura a faixa de cartas da tela (regiao que cobre todos os slots)."""
+        return self.capturer.grab(self._capture_region)
+
+    def _get_debug_buffer(self, frame: np.ndarray) -> np.ndarray:
+        """Reaproveita o canvas do debug view (faixa capturada + painel de revisao)."""
+        panel_height = CARD_HEIGHT * REVIEW_OVERLAY_SCALE + 2 * REVIEW_PANEL_PADDING
+        shape = (frame.shape[0] + panel_height,) + frame.shape[1:]
+        if self._debug_frame is None or self._debug_frame.shape != shape:
+            self._debug_frame = np.empty(shape, dtype=frame.dtype)
+        return self._debug_frame
+
+    def _build_slot_rects(self) -> list[Optional[Tuple[int, int, int, int]]]:
+        """Converte os slots para coordenadas do frame e valida os limites uma unica vez."""
+        rects: list[Optional[Tuple[int, int, int, int]]] = []
+        for slot_id, cfg in enumerate(SLOTS_CONFIG):
+            x = cfg["left"] - self.monitor["left"]
+            y = cfg["top"] - self.monitor["top"]
+            if (
+                x < 0
+                or y < 0
+                or x + CARD_WIDTH > self.monitor["width"]
+                or y + CARD_HEIGHT > self.monitor["height"]
+            ):
+                print(f"[WARN][SLOTS] Slot S{slot_id} fora da area capturada. Ignorando.")
+                rects.append(None)
+                continue
+            rects.append((x, y, x + CARD_WIDTH, y + CARD_HEIGHT))
+        return rects
+
+    def _fit_capture_region(self) -> dict:
+        """Restringe a captura ao retangulo dos slots e passa os slots para essa origem."""
+        rects = [rect for rect in self._slot_rects if rect]
+        if not rects:
+            return self.monitor
+
+        left = max(0, min(rect[0] for rect in rects) - CAPTURE_REGION_MARGIN)
+        top = max(0, min(rect[1] for rect in rects) - CAPTURE_REGION_MARGIN)
+        right = min(self.monitor["width"], max(rect[2] for rect in rects) + CAPTURE_REGION_MARGIN)
+        bottom = min(self.monitor["height"], max(rect[3] for rect in rects) + CAPTURE_REGION_MARGIN)
+
+        self._slot_rects = [
+            (rect[0] - left, rect[1] - top, rect[2] - left, rect[3] - top) if rect else None
+            for rect in self._slot_rects
+        ]
+        return {
+            "left": self.monitor["left"] + left,
+            "top": self.monitor["top"] + top,
+            "width": right - left,
+            "height": bottom - top,
+        }
 
     def get_slot_roi(self, frame: np.ndarray, slot_id: int) -> Optional[np.ndarray]:
         """Recorta a regiao do slot no frame atual."""
-        cfg = SLOTS_CONFIG[slot_id]
-        x = cfg["left"] - self.monitor["left"]
-        y = cfg["top"] - self.monitor["top"]
-        if x < 0 or y < 0 or x + CARD_WIDTH > frame.shape[1] or y + CARD_HEIGHT > frame.shape[0]:
+        rect = self._slot_rects[slot_id]
+        if rect is None:
             return None
-        return frame[y : y + CARD_HEIGHT, x : x + CARD_WIDTH]
+        x1, y1, x2, y2 = rect
+        return frame[y1:y2, x1:x2]
+
+    def _gather_slots(self, frame: np.ndarray) -> np.ndarray:
+        """Copia os slots ativos do frame para o buffer contiguo (N, H, W, 3)."""
+        for index, slot_id in enumerate(self._active_slots):
+            x1, y1, x2, y2 = self._slot_rects[slot_id]
+            self._slot_stack[index] = frame[y1:y2, x1:x2]
+        return self._slot_stack
 
     @staticmethod
-    def get_slot_saturation(slot_img: np.ndarray) -> float:
-        """Calcula saturacao media do slot em HSV."""
-        hsv = cv2.cvtColor(slot_img, cv2.COLOR_BGR2HSV)
-        return float(np.mean(hsv[:, :, 1]))
+    def _red_background_mask(slot_stack: np.ndarray) -> np.ndarray:
+        """Indica, por slot, se o centro corresponde ao padrao vermelho de vazio."""
+        avg_colors = np.array(
+            [cv2.mean(slot_img[SLOT_CENTER_ROWS, SLOT_CENTER_COLS])[:3] for slot_img in slot_stack]
+        ).reshape(-1, 3)
+        diff = RED_BACKGROUND_COLORS_BGR[np.newaxis, :, :] - avg_colors[:, np.newaxis, :]
+        return (diff * diff).sum(axis=2).min(axis=1) < RED_COLOR_TOLERANCE_SQ
 
     @staticmethod
-    def hex_to_bgr(hex_color: str) -> Tuple[int, int, int]:
-        """Converte cor hexadecimal para tupla BGR."""
-        hex_color = hex_color.lstrip("#")
-        r = int(hex_color[0:2], 16)
-        g = int(hex_color[2:4], 16)
-        b = int(hex_color[4:6], 16)
-        return (b, g, r)
-
-    def is_background_red(self, slot_img: np.ndarray) -> bool:
-        """Verifica se o fundo do slot corresponde ao padrao vermelho de vazio."""
-        red_colors_bgr = [self.hex_to_bgr(color) for color in RED_BACKGROUND_COLORS_HEX]
-        h, w, _ = slot_img.shape
-        center_roi = slot_img[
-            max(0, h // 2 - SLOT_ROI_CENTER_SIZE) : min(h, h // 2 + SLOT_ROI_CENTER_SIZE),
-            max(0, w // 2 - SLOT_ROI_CENTER_SIZE) : min(w, w // 2 + SLOT_ROI_CENTER_SIZE),
-        ]
-        if center_roi.size == 0:
-            return False
+    def _saturation_means(slot_stack: np.ndarray) -> np.ndarray:
+        """Calcula a saturacao media HSV de cada slot com uma unica conversao.
+
+        A media e estimada sobre 1 a cada SATURATION_ROW_STEP linhas, o que reduz a
+        conversao para HSV na mesma proporcao sem mudar a classificacao dos templates.
+        """
+        sampled = np.ascontiguousarray(slot_stack[:, ::SATURATION_ROW_STEP])
+        count, height, width, channels = sampled.shape
+        hsv = cv2.cvtColor(sampled.reshape(count * height, width, channels), cv2.COLOR_BGR2HSV)
+        saturation = cv2.extractChannel(hsv, 1)
+        return np.array(
+            [cv2.mean(saturation[i * height : (i + 1) * height])[0] for i in range(count)]
+        )
+
+    def _classify_slots(self, frame: np.ndarray) -> np.ndarray:
+        """Retorna, para cada slot ativo, se ha carta (fundo nao vermelho e saturado).
+
+        Se os pixels dos slots nao mudaram desde o frame anterior, o resultado anterior
+        e reaproveitado. O teste de vermelho e mais barato e cobre a maioria dos frames
+        (slot vazio), entao a conversao para HSV so roda quando algum slot nao e vermelho.
+        """
+        slot_stack = self._gather_slots(frame)
+        if self._last_is_full is not None and np.array_equal(slot_stack, self._previous_slot_stack):
+            return self._last_is_full
 
-        avg_color = np.mean(center_roi, axis=(0, 1))
-        for reference_color in red_colors_bgr:
-            distance = np.linalg.norm(avg_color - np.array(reference_color))
-            if distance < RED_COLOR_TOLERANCE:
-                return True
-        return False
+        is_red_bg = self._red_background_mask(slot_stack)
+        if is_red_bg.all():
+            is_full = ~is_red_bg
+        else:
+            is_full = ~is_red_bg & (self._saturation_means(slot_stack) > SATURATION_THRESHOLD)
+
+        self._slot_stack, self._previous_slot_stack = self._previous_slot_stack, self._slot_stack
+        self._last_is_full = is_full
+        return is_full
 
     def _register_slot_identity(self, slot_id: int, card_name: str) -> None:
         """Grava a primeira identidade da carta do slot e evita remapeamento."""
@@ -286,46 +554,141 @@ class GameWatcher:
         except Exception as exc:
             print(f"[ERROR][TEMPLATE_SAVE] Falha ao salvar '{save_path.name}': {exc}")
 
-    def _identify_unknown_slot(self, slot_id: int) -> Tuple[Optional[str], str]:
-        """Identifica uma carta ainda desconhecida para o slot informado."""
-        time.sleep(POST_PLAY_CAPTURE_DELAY_SECONDS)
-        frame_updated = self.capture_screen()
-        if frame_updated is None:
-            return (None, "FALHA_CAPTURA")
+    def _identify_unknown_slots(
+        self, slot_ids: list[int], frame: np.ndarray
+    ) -> list[Tuple[int, str, str]]:
+        """Identifica de uma vez os slots desconhecidos; sem confianca, envia para revisao manual."""
+        crops = []
+        for slot_id in slot_ids:
+            slot_img = self.get_slot_roi(frame, slot_id)
+            if slot_img is not None:
+                crops.append((slot_id, slot_img.copy()))
+        if not crops:
+            return []
+
+        guesses = self.card_identifier.get_best_guesses([slot_img for _, slot_img in crops])
+        identified: list[Tuple[int, str, str]] = []
+        for (slot_id, slot_img), (best_guess, best_score) in zip(crops, guesses):
+            if best_score >= CONFIRMATION_THRESHOLD and best_guess:
+                print(f"[LEARN][TEMPLATE] S{slot_id}={best_guess} (score={best_score:.2f})")
+                identified.append((slot_id, best_guess, "TEMPLATE"))
+                continue
 
-        slot_img_updated = self.get_slot_roi(frame_updated, slot_id)
-        if slot_img_updated is None:
-            return (None, "FALHA_ROI")
+            print(f"[REVIEW] S{slot_id} sugestao='{best_guess}' score={best_score:.2f}")
+            self._slots_in_review.add(slot_id)
+            if self.headless:
+                self._review_requests.put((slot_id, slot_img, best_guess, best_score))
+                continue
 
-        best_guess, best_score = self.card_identifier.get_best_guess(slot_img_updated)
-        if best_score >= CONFIRMATION_THRESHOLD and best_guess:
-            print(f"[LEARN][TEMPLATE] S{slot_id}={best_guess} (score={best_score:.2f})")
-            return (best_guess, "TEMPLATE")
+            print("[REVIEW] No Debug View: y confirma sugestao, n ignora, e corrige pelo terminal.")
+            self._review_backlog.append((slot_id, slot_img, best_guess, best_score))
+        return identified
 
-        cv2.imshow(f"CONFIRMACAO - Slot {slot_id}", slot_img_updated)
-        cv2.waitKey(100)
+    def _handle_review_key(self, key: int) -> None:
+        """Resolve a revisao mais antiga pela tecla lida no Debug View."""
+        if not self._review_backlog or key not in (_KEY_YES, _KEY_NO, _KEY_EDIT):
+            return
 
-        print(f"[REVIEW] S{slot_id} sugestao='{best_guess}' score={best_score:.2f}")
-        print("[REVIEW] ENTER confirma sugestao; digite nome para corrigir.")
+        slot_id, slot_img, best_guess, best_score = self._review_backlog[0]
+        if key == _KEY_YES and not best_guess:
+            return
 
-        try:
-            user_input = input("Revisao> ").strip()
-        except EOFError:
-            user_input = ""
+        self._review_backlog.popleft()
+        if key == _KEY_EDIT:
+            self._review_requests.put((slot_id, slot_img, best_guess, best_score))
+            return
+
+        self._slots_in_review.discard(slot_id)
+        if key == _KEY_NO:
+            print(f"[LEARN][SKIP] S{slot_id}")
+            self._resolve_play(slot_id, None, "IGNORADO")
+            return
+
+        print(f"[LEARN][MANUAL] S{slot_id}={best_guess}")
+        self._save_user_template(best_guess, slot_img)
+        self._resolve_play(slot_id, best_guess, "MANUAL")
 
-        cv2.destroyWindow(f"CONFIRMACAO - Slot {slot_id}")
+    def _review_worker(self) -> None:
+        """Atende as correcoes pelo terminal sem travar o loop de captura.
 
-        final_name = best_guess
-        if user_input:
-            final_name = user_input.strip().title()
+        Sem terminal (stdin fechado), as revisoes sao descartadas: confirmar a sugestao
+        sem ninguem olhar gravaria templates errados em cards-templates-user.
+        """
+        stdin_closed = False
+        while True:
+            slot_id, slot_img, best_guess, _ = self._review_requests.get()
+            if stdin_closed:
+                print(f"[LEARN][SKIP] S{slot_id} (sem terminal para revisao)")
+                self._review_results.put((slot_id, None, "IGNORADO"))
+                continue
+
+            print(f"[REVIEW] S{slot_id}: ENTER confirma '{best_guess}'; digite nome para corrigir.")
+            try:
+                user_input = input("Revisao> ").strip()
+            except EOFError:
+                print("[WARN][REVIEW] stdin fechado: revisoes pelo terminal serao ignoradas.")
+                stdin_closed = True
+                print(f"[LEARN][SKIP] S{slot_id} (sem terminal para revisao)")
+                self._review_results.put((slot_id, None, "IGNORADO"))
+                continue
 
-        if final_name:
-            print(f"[LEARN][MANUAL] S{slot_id}={final_name}")
-            self._save_user_template(final_name, slot_img_updated)
-            return (final_name, "MANUAL")
+            final_name = best_guess
+            if user_input:
+                final_name = user_input.strip().title()
+
+            if final_name:
+                print(f"[LEARN][MANUAL] S{slot_id}={final_name}")
+                self._save_user_template(final_name, slot_img)
+                self._review_results.put((slot_id, final_name, "MANUAL"))
+            else:
+                print(f"[LEARN][SKIP] S{slot_id}")
+                self._review_results.put((slot_id, None, "IGNORADO"))
+
+    def _process_pending_identifications(self, frame: np.ndarray) -> None:
+        """Identifica os slots cujo atraso pos-jogada venceu e aplica revisoes concluidas."""
+        now = time.monotonic()
+        due_slots = [slot_id for slot_id, deadline in self._pending_captures.items() if now >= deadline]
+        if due_slots:
+            for slot_id in due_slots:
+                del self._pending_captures[slot_id]
+            # Slot que voltou a ficar vazio durante o atraso nao tem carta para comparar.
+            full_slots = []
+            for slot_id in due_slots:
+                if self.slots_status[slot_id] == SLOT_FULL:
+                    full_slots.append(slot_id)
+                else:
+                    print(f"[WARN][SLOT] S{slot_id} vazio no momento da captura. Identificacao ignorada.")
+                    self._resolve_play(slot_id, None, "IGNORADO")
+            for slot_id, identified_card, source in self._identify_unknown_slots(full_slots, frame):
+                self._resolve_play(slot_id, identified_card, source)
 
-        print(f"[LEARN][SKIP] S{slot_id}")
-        return (None, "IGNORADO")
+        while True:
+            try:
+                slot_id, reviewed_card, source = self._review_results.get_nowait()
+            except queue.Empty:
+                break
+            self._slots_in_review.discard(slot_id)
+            self._resolve_play(slot_id, reviewed_card, source)
+
+    def _resolve_play(self, slot_id: int, card_name: Optional[str], source: str) -> None:
+        """Fecha a jogada pendente do slot; sem carta, a jogada e descartada."""
+        record = self._pending_plays.pop(slot_id)
+        record.card_name, record.source, record.resolved = card_name, source, True
+        if card_name:
+            self._register_slot_identity(slot_id, card_name)
+        self._flush_resolved_plays()
+
+    def _flush_resolved_plays(self) -> None:
+        """Envia ao tracker as jogadas resolvidas do inicio da fila, na ordem das transicoes.
+
+        Uma jogada ainda aguardando captura ou revisao segura as seguintes (inclusive as de
+        MEMORIA), porque o ciclo FIFO do tracker depende da ordem em que as cartas sairam.
+        """
+        while self._play_records and self._play_records[0].resolved:
+            record = self._play_records.popleft()
+            if record.card_name:
+                self._log_play_event(record.slot_id, record.card_name, record.source)
+                self.opponent_tracker.register_play(record.card_name, record.source, record.slot_id)
 
     @staticmethod
     def _log_play_event(slot_id: int, card_name: str, source: str) -> None:
@@ -334,28 +697,95 @@ class GameWatcher:
 
     def _handle_play_transition(self, slot_id: int) -> None:
         """Processa a transicao EMPTY->FULL para um slot especifico."""
+        if slot_id in self._pending_plays:
+            return
+
         known_card = self.slots_identity[slot_id]
         if known_card:
-            self._log_play_event(slot_id, known_card, "MEMORIA")
-            self.opponent_tracker.register_play(known_card, "MEMORIA", slot_id)
+            self._play_records.append(PlayRecord(slot_id, known_card, "MEMORIA", resolved=True))
+            self._flush_resolved_plays()
             return
 
-        identified_card, source = self._identify_unknown_slot(slot_id)
-        if identified_card:
-            self._register_slot_identity(slot_id, identified_card)
-            self._log_play_event(slot_id, identified_card, source)
-            self.opponent_tracker.register_play(identified_card, source, slot_id)
+        # A posicao no tracker e reservada agora; a carta so e identificada depois.
+        record = PlayRecord(slot_id)
+        self._play_records.append(record)
+        self._pending_plays[slot_id] = record
+
+        # A carta ainda esta animando: o recorte e feito apos POST_PLAY_CAPTURE_DELAY_SECONDS.
+        self._pending_captures[slot_id] = time.monotonic() + POST_PLAY_CAPTURE_DELAY_SECONDS
+
+    def _draw_review_overlay(self, debug_frame: np.ndarray, panel_top: int) -> None:
+        """Desenha no painel do Debug View o recorte e a sugestao da revisao pendente."""
+        slot_id, slot_img, best_guess, best_score = self._review_backlog[0]
+        x, y = REVIEW_PANEL_PADDING, panel_top + REVIEW_PANEL_PADDING
+        height, width = CARD_HEIGHT * REVIEW_OVERLAY_SCALE, CARD_WIDTH * REVIEW_OVERLAY_SCALE
+        if x + width > debug_frame.shape[1]:
+            return
+
+        cv2.resize(
+            slot_img,
+            (width, height),
+            dst=debug_frame[y : y + height, x : x + width],
+            interpolation=cv2.INTER_NEAREST,
+        )
+        cv2.rectangle(debug_frame, (x, y), (x + width, y + height), (0, 255, 255), 2)
+        cv2.putText(
+            debug_frame,
+            f"S{slot_id}: {best_guess or '?'} ({best_score:.2f}) [y/n/e]",
+            (x + width + REVIEW_PANEL_PADDING, y + 20),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.6,
+            (0, 255, 255),
+            1,
+        )
+
+    def _render_debug_view(self, frame: np.ndarray) -> None:
+        """Desenha os slots com estado/identidade e mostra o debug view."""
+        debug_frame = self._get_debug_buffer(frame)
+        panel_top = frame.shape[0]
+        np.copyto(debug_frame[:panel_top], frame)
+        debug_frame[panel_top:] = 0
+
+        for slot_id in self._active_slots:
+            x, y, x2, y2 = self._slot_rects[slot_id]
+            color = (0, 255, 0) if self.slots_status[slot_id] == SLOT_FULL else (0, 0, 255)
+            cv2.rectangle(debug_frame, (x, y), (x2, y2), color, 2)
+
+            label = f"S{slot_id}: {self.slots_identity[slot_id] or '?'}"
+            cv2.putText(
+                debug_frame,
+                label,
+                (x, y - 10),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.5,
+                (255, 255, 255),
+                1,
+            )
+
+        if self._review_backlog:
+            self._draw_review_overlay(debug_frame, panel_top)
+
+        try:
+            cv2.imshow("Debug View", debug_frame)
+        except Exception:
+            pass
 
     def run(self) -> None:
         """Executa o loop principal de monitoramento dos slots."""
         print("[SYS] Watcher iniciado")
         print(f"[SYS] Slots monitorados: {len(SLOTS_CONFIG)}")
-        print("[SYS] Pressione 'q' para sair")
+        if self.headless:
+            print("[SYS] Modo headless (WATCHER_HEADLESS=1): Ctrl+C para sair")
+        else:
+            print("[SYS] Pressione 'q' para sair")
 
         consecutive_failures = 0
+        frame_index = 0
+        last_change = time.monotonic()
 
         while True:
             try:
+                frame_start = time.monotonic()
                 frame = self.capture_screen()
                 if frame is None:
                     consecutive_failures += 1
@@ -370,57 +800,47 @@ class GameWatcher:
                     continue
 
                 consecutive_failures = 0
-                debug_frame = frame.copy()
-
-                for slot_id in range(len(SLOTS_CONFIG)):
-                    slot_img = self.get_slot_roi(frame, slot_id)
-                    if slot_img is None:
-                        continue
-
-                    is_red_bg = self.is_background_red(slot_img)
-                    is_saturated = self.get_slot_saturation(slot_img) > SATURATION_THRESHOLD
-                    current_state = "FULL" if (not is_red_bg and is_saturated) else "EMPTY"
-                    previous_state = self.slots_status[slot_id]
-
-                    cfg = SLOTS_CONFIG[slot_id]
-                    x = cfg["left"] - self.monitor["left"]
-                    y = cfg["top"] - self.monitor["top"]
-                    color = (0, 255, 0) if current_state == "FULL" else (0, 0, 255)
-                    cv2.rectangle(debug_frame, (x, y), (x + CARD_WIDTH, y + CARD_HEIGHT), color, 2)
-
-                    label = f"S{slot_id}: {self.slots_identity[slot_id] or '?'}"
-                    cv2.putText(
-                        debug_frame,
-                        label,
-                        (x, y - 10),
-                        cv2.FONT_HERSHEY_SIMPLEX,
-                        0.5,
-                        (255, 255, 255),
-                        1,
-                    )
-
-                    if previous_state == "EMPTY" and current_state == "FULL":
-                        self._handle_play_transition(slot_id)
-
-                    self.slots_status[slot_id] = current_state
+                is_full = self._classify_slots(frame)
+                previous_status = self.slots_status[self._active_index]
+                current_status = np.where(is_full, SLOT_FULL, SLOT_EMPTY)
+                self.slots_status[self._active_index] = current_status
+                for index in np.flatnonzero((previous_status == SLOT_EMPTY) & is_full):
+                    self._handle_play_transition(self._active_slots[index])
+
+                self._process_pending_identifications(frame)
+
+                # Sem mudanca nos slots por um tempo, o polling desacelera ate a proxima jogada.
+                now = time.monotonic()
+                if (
+                    not np.array_equal(previous_status, current_status)
+                    or self._pending_captures
+                    or self._slots_in_review
+                ):
+                    last_change = now
+                stable = now - last_change > STABLE_SLOTS_SECONDS
+                poll_seconds = IDLE_POLL_SECONDS if stable else ACTIVE_POLL_SECONDS
+
+                if self.headless:
+                    time.sleep(max(0.0, poll_seconds - (time.monotonic() - frame_start)))
+                    continue
 
-                try:
-                    dim = (
-                        int(debug_frame.shape[1] * DEBUG_VIEW_SCALE),
-                        int(debug_frame.shape[0] * DEBUG_VIEW_SCALE),
-                    )
-                    resized = cv2.resize(debug_frame, dim, interpolation=cv2.INTER_AREA)
-                    cv2.imshow("Debug View", resized)
-                except Exception:
-                    pass
+                if frame_index % DEBUG_VIEW_STRIDE == 0:
+                    self._render_debug_view(frame)
+                frame_index += 1
 
-                if cv2.waitKey(1) & 0xFF == ord("q"):
+                # O intervalo conta a partir do inicio do frame: o tempo gasto com captura
+                # e processamento ja sai da espera, limitando o loop a TARGET_FPS.
+                wait_seconds = poll_seconds - (time.monotonic() - frame_start)
+                key = cv2.waitKey(max(1, int(wait_seconds * 1000))) & 0xFF
+                if key == _KEY_Q:
                     break
+                self._handle_review_key(key)
 
             except KeyboardInterrupt:
                 break
 
-        cv2.destroyAllWindows()
+        if not self.headless:
+            cv2.destroyAllWindows()
 
 
 if __name__ == "__main__":
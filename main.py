@@ -3,7 +3,7 @@
 from collections import deque
 from dataclasses import dataclass
 import os
-from typing import List, Optional, Sequence
+from typing import Dict, List, Optional, Sequence
 
 from dotenv import load_dotenv
 import requests
@@ -26,13 +26,14 @@ class ClashRoyaleAPI:
     def __init__(self, token: str):
         if not token:
             raise ValueError("O token da API nao pode ser vazio.")
-        self._token = token
+        self._session = requests.Session()
+        self._session.headers.update({"Authorization": f"Bearer {token}"})
+        self._cartas_por_nome: Optional[Dict[str, Carta]] = None
 
     def listar_cartas(self) -> List[Carta]:
         """Retorna todas as cartas disponiveis na API."""
         url = f"{self.BASE_URL}/cards"
-        headers = {"Authorization": f"Bearer {self._token}"}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = self._session.get(url, timeout=10)
         response.raise_for_status()
 
         payload = response.json()
@@ -47,11 +48,17 @@ class ClashRoyaleAPI:
         return cartas
 
     def cartas_por_nomes(self, nomes: Sequence[str]) -> List[Carta]:
-        """Busca cartas pelo nome exato, ignorando diferenca de caixa."""
-        cartas_disponiveis = self.listar_cartas()
+        """Busca cartas pelo nome exato, ignorando diferenca de caixa.
+
+        A lista da API e consultada uma unica vez por instancia; chamadas seguintes
+        reutilizam o indice por nome.
+        """
+        if self._cartas_por_nome is None:
+            self._cartas_por_nome = {carta.nome.lower(): carta for carta in self.listar_cartas()}
+        cartas_por_nome = self._cartas_por_nome
         cartas_encontradas: List[Carta] = []
         for nome in nomes:
-            carta = next((c for c in cartas_disponiveis if c.nome.lower() == nome.lower()), None)
+            carta = cartas_por_nome.get(nome.lower())
             if carta is None:
                 raise ValueError(f"Carta '{nome}' nao encontrada na API.")
             cartas_encontradas.append(carta)
@@ -1,5 +1,7 @@
 """Camada de captura de tela com fallback entre diferentes backends."""
 
+import os
+import platform
 import subprocess
 
 import cv2
@@ -7,16 +9,39 @@ import mss
 import numpy as np
 from PIL import ImageGrab
 
+# O gnome-screenshot so escreve em arquivo; em /dev/shm a ida e volta fica em memoria.
+GNOME_CAPTURE_FILE = (
+    "/dev/shm/clash_screen_capture.png" if os.path.isdir("/dev/shm") else "/tmp/clash_screen_capture.png"
+)
+
 
 class ScreenCapture:
     """Fornece captura de tela em BGR para processamento com OpenCV."""
 
     def __init__(self, monitor_index: int = 1):
         self.sct = None
-        self.backend = None
         self.monitor_info = {"top": 0, "left": 0, "width": 1920, "height": 1080}
+        self._frame_buffer: np.ndarray | None = None
+        self._dxcam = None
+        self._dxgi_last: tuple[tuple, np.ndarray] | None = None
 
         print("[CAPTURE][INIT] Inicializando sistema de captura")
+        self.backend = self._select_backend(monitor_index)
+        # O metodo de captura e resolvido uma vez; grab() nao compara o backend a cada frame.
+        self._grab_impl = {
+            "dxgi": self._grab_dxgi,
+            "mss": self._grab_mss,
+            "pil": self._grab_pil,
+            "grim": self._grab_grim,
+            "gnome": self._grab_gnome,
+            "none": lambda region: None,
+        }[self.backend]
+
+    def _select_backend(self, monitor_index: int) -> str:
+        """Testa os backends em ordem de preferencia e retorna o primeiro que funciona."""
+        if platform.system() == "Windows" and self._create_dxgi_camera(monitor_index):
+            print("[CAPTURE][OK] Backend selecionado: DXGI (dxcam)")
+            return "dxgi"
 
         try:
             self.sct = mss.mss()
@@ -25,10 +50,10 @@ class ScreenCapture:
             else:
                 self.monitor = self.sct.monitors[0]
 
-            self.sct.grab(self.monitor)
-            self.backend = "mss"
+            # Basta 1 pixel para validar o backend; nao precisa trazer o monitor inteiro.
+            self.sct.grab({"top": self.monitor["top"], "left": self.monitor["left"], "width": 1, "height": 1})
             print("[CAPTURE][OK] Backend selecionado: MSS")
-            return
+            return "mss"
         except Exception as exc:
             print(f"[CAPTURE][WARN] MSS indisponivel: {exc}")
             self.sct = None
@@ -36,13 +61,21 @@ class ScreenCapture:
         try:
             img = ImageGrab.grab()
             width, height = img.size
-            self.backend = "pil"
             self.monitor_info = {"top": 0, "left": 0, "width": width, "height": height}
             print("[CAPTURE][OK] Backend selecionado: PIL")
-            return
+            return "pil"
         except Exception as exc:
             print(f"[CAPTURE][WARN] PIL indisponivel: {exc}")
 
+        try:
+            img = self._grab_grim()
+            height, width = img.shape[:2]
+            self.monitor_info = {"top": 0, "left": 0, "width": width, "height": height}
+            print("[CAPTURE][OK] Backend selecionado: GRIM (Wayland)")
+            return "grim"
+        except Exception as exc:
+            print(f"[CAPTURE][WARN] GRIM indisponivel: {exc}")
+
         try:
             subprocess.run(
                 ["gnome-screenshot", "--version"],
@@ -50,36 +83,116 @@ class ScreenCapture:
                 stderr=subprocess.DEVNULL,
                 check=True,
             )
-            self.backend = "gnome"
             print("[CAPTURE][OK] Backend selecionado: GNOME_SCREENSHOT (lento)")
-            return
+            return "gnome"
         except Exception as exc:
             print(f"[CAPTURE][WARN] GNOME_SCREENSHOT indisponivel: {exc}")
 
         print("[CAPTURE][ERROR] Nenhum metodo de captura funcionou")
         print("[CAPTURE][HINT] Em Linux Wayland, tente uma sessao X11")
-        self.backend = "none"
+        return "none"
+
+    def _create_dxgi_camera(self, monitor_index: int) -> bool:
+        """Abre o dxcam (opcional) se a saida dele for o mesmo monitor que o mss usaria.
 
-    def grab(self) -> np.ndarray | None:
-        """Captura a tela e retorna um frame BGR."""
+        O dxcam so captura a saida 0 do adaptador 0, e o `monitors[monitor_index]` do mss
+        (usado na calibracao) nao e necessariamente o principal. Sem coincidir origem e
+        tamanho, o DXGI capturaria outra tela, entao a captura fica com o mss.
+        """
         try:
-            if self.backend == "mss":
-                sct_img = self.sct.grab(self.monitor)
-                return cv2.cvtColor(np.array(sct_img), cv2.COLOR_BGRA2BGR)
-
-            if self.backend == "pil":
-                img = ImageGrab.grab()
-                return cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
-
-            if self.backend == "gnome":
-                filename = "/tmp/clash_screen_capture.png"
-                subprocess.run(["gnome-screenshot", "-f", filename], check=True)
-                return cv2.imread(filename)
-        except Exception:
-            pass
+            import dxcam
+        except ImportError:
+            return False
+
+        try:
+            camera = dxcam.create(output_idx=0, output_color="BGR")
+            if camera is None:
+                raise RuntimeError("dxcam.create nao retornou camera")
+            with mss.mss() as sct:
+                monitors = sct.monitors
+                monitor = monitors[monitor_index] if len(monitors) > monitor_index else monitors[0]
+
+            geometry = (monitor["left"], monitor["top"], monitor["width"], monitor["height"])
+            if geometry != (0, 0, camera.width, camera.height):
+                camera.release()
+                print("[CAPTURE][WARN] DXGI ignorado: a saida do dxcam nao e o monitor calibrado")
+                return False
+        except Exception as exc:
+            print(f"[CAPTURE][WARN] DXGI indisponivel: {exc}")
+            return False
+
+        self._dxcam = camera
+        self.monitor_info = {"top": 0, "left": 0, "width": camera.width, "height": camera.height}
+        return True
+
+    def grab(self, region: dict | None = None) -> np.ndarray | None:
+        """Captura a tela (ou so `region`, em coordenadas de tela) e retorna um frame BGR.
 
+        No backend MSS o frame e escrito sempre no mesmo buffer: ele so vale ate a
+        proxima chamada, entao quem precisar guarda-lo deve fazer uma copia.
+        """
+        try:
+            return self._grab_impl(region)
+        except Exception:
+            return None
+
+    def _grab_mss(self, region: dict | None) -> np.ndarray:
+        """Captura via mss, convertendo BGRA para BGR no buffer reaproveitado."""
+        sct_img = self.sct.grab(region or self.monitor)
+        # Le o buffer BGRA do mss sem copia; a unica passada e a conversao para BGR.
+        bgra = np.frombuffer(sct_img.raw, dtype=np.uint8).reshape(sct_img.height, sct_img.width, 4)
+        if self._frame_buffer is None or self._frame_buffer.shape[:2] != bgra.shape[:2]:
+            self._frame_buffer = np.empty((sct_img.height, sct_img.width, 3), dtype=np.uint8)
+        return cv2.cvtColor(bgra, cv2.COLOR_BGRA2BGR, dst=self._frame_buffer)
+
+    @staticmethod
+    def _grab_pil(region: dict | None) -> np.ndarray:
+        """Captura via PIL ImageGrab."""
+        bbox = None
+        if region:
+            bbox = (
+                region["left"],
+                region["top"],
+                region["left"] + region["width"],
+                region["top"] + region["height"],
+            )
+        img = ImageGrab.grab(bbox=bbox)
+        return cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
+
+    @staticmethod
+    def _grab_gnome(region: dict | None) -> np.ndarray | None:
+        """Captura via gnome-screenshot (arquivo intermediario) e recorta a regiao."""
+        subprocess.run(["gnome-screenshot", "-f", GNOME_CAPTURE_FILE], check=True)
+        frame = cv2.imread(GNOME_CAPTURE_FILE)
+        if frame is not None and region:
+            top, left = region["top"], region["left"]
+            frame = frame[top : top + region["height"], left : left + region["width"]]
+        return frame
+
+    def _grab_dxgi(self, region: dict | None) -> np.ndarray | None:
+        """Captura via dxcam; sem frame novo do compositor, repete o ultimo da mesma regiao."""
+        area = region or self.monitor_info
+        bbox = (area["left"], area["top"], area["left"] + area["width"], area["top"] + area["height"])
+        frame = self._dxcam.grab(region=bbox)
+        if frame is not None:
+            self._dxgi_last = (bbox, frame)
+            return frame
+        if self._dxgi_last is not None and self._dxgi_last[0] == bbox:
+            return self._dxgi_last[1]
         return None
 
+    @staticmethod
+    def _grab_grim(region: dict | None = None) -> np.ndarray:
+        """Captura via `grim`, lendo o PPM direto do stdout (sem arquivo intermediario)."""
+        command = ["grim", "-t", "ppm"]
+        if region:
+            command += ["-g", f"{region['left']},{region['top']} {region['width']}x{region['height']}"]
+        result = subprocess.run(command + ["-"], capture_output=True, check=True)
+        frame = cv2.imdecode(np.frombuffer(result.stdout, dtype=np.uint8), cv2.IMREAD_COLOR)
+        if frame is None:
+            raise RuntimeError("saida do grim nao e uma imagem valida")
+        return frame
+
     def get_monitor_info(self) -> dict:
         """Retorna as dimensoes do monitor de captura ativo."""
         if self.backend == "mss":